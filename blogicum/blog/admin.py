@@ -1,11 +1,41 @@
 from django.contrib import admin
+from django.forms import BaseInlineFormSet
+from django.utils.text import Truncator
 
 from .models import Category, Comment, Location, Post
 
 
+MAX_LENGTH_TEXT_PREVIEW = 80
+MAX_NUM_INLINE_POSTS = 20
+
+
+class TextPreviewMixin:
+
+    @admin.display(description='Текст')
+    def text_preview(self, obj):
+        return Truncator(obj.text).chars(MAX_LENGTH_TEXT_PREVIEW)
+
+
+class PostInlineFormSet(BaseInlineFormSet):
+
+    def get_queryset(self):
+        if not hasattr(self, '_queryset'):
+            self._queryset = super().get_queryset()[:MAX_NUM_INLINE_POSTS]
+        return self._queryset
+
+
 class PostInline(admin.TabularInline):
     model = Post
+    formset = PostInlineFormSet
     extra = 0
+    max_num = MAX_NUM_INLINE_POSTS
+    can_delete = False
+    show_change_link = True
+    raw_id_fields = (
+        'author',
+        'location',
+        'category',
+    )
 
 
 class CategoryAdmin(admin.ModelAdmin):
@@ -42,10 +72,10 @@ class LocationAdmin(admin.ModelAdmin):
     list_display_links = ('name',)
 
 
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(TextPreviewMixin, admin.ModelAdmin):
     list_display = (
         'title',
-        'text',
+        'text_preview',
         'pub_date',
         'author',
         'location',
@@ -54,26 +84,37 @@ class PostAdmin(admin.ModelAdmin):
         'created_at'
     )
     list_editable = (
-        'text',
         'pub_date',
+        'is_published',
+    )
+    list_display_links = ('title',)
+    list_select_related = (
+        'author',
+        'location',
+        'category',
+    )
+    raw_id_fields = (
         'author',
         'location',
         'category',
-        'is_published',
     )
-    list_display_links = ('title',)
 
 
-class CommentAdmin(admin.ModelAdmin):
+class CommentAdmin(TextPreviewMixin, admin.ModelAdmin):
     list_display = (
         'pk',
-        'text',
+        'text_preview',
         'post',
         'created_at',
         'author',
     )
-    list_editable = (
-        'text',
+    list_select_related = (
+        'post',
+        'author',
+    )
+    raw_id_fields = (
+        'post',
+        'author',
     )
 
 
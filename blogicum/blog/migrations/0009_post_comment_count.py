@@ -0,0 +1,34 @@
+# Generated by Django 3.2.16 on 2026-10-15 01:52
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_comment_count(apps, schema_editor):
+    Comment = apps.get_model('blog', 'Comment')
+    Post = apps.get_model('blog', 'Post')
+    comment_count = Comment.objects.filter(
+        post=OuterRef('pk')
+    ).order_by().values('post').annotate(
+        count=Count('*')
+    ).values('count')
+    Post.objects.update(
+        comment_count=Coalesce(Subquery(comment_count), 0)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_post_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество комментариев'),
+        ),
+        migrations.RunPython(fill_comment_count, migrations.RunPython.noop),
+    ]
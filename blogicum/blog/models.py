@@ -73,9 +73,28 @@ class Post(PublishedCreatedModel):
         related_name='posts',
         verbose_name='Категория'
     )
+    comment_count = models.PositiveIntegerField(
+        'Количество комментариев',
+        default=0,
+        editable=False
+    )
 
     class Meta:
         ordering = ('-pub_date', 'title')
+        indexes = (
+            models.Index(
+                fields=('-pub_date', 'is_published'),
+                name='post_pub_idx'
+            ),
+            models.Index(
+                fields=('author', '-pub_date'),
+                name='post_author_pub_idx'
+            ),
+            models.Index(
+                fields=('category', '-pub_date'),
+                name='post_category_pub_idx'
+            ),
+        )
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
 
@@ -0,0 +1,80 @@
+from functools import cached_property
+
+from django.core.cache import cache
+from django.core.paginator import EmptyPage, Paginator
+
+
+# The cached count may lag behind the database for up to the timeout:
+# with the default per-process LocMemCache, invalidation only reaches the
+# process that saved the object, and a scheduled post becoming visible
+# fires no signal at all. page() therefore never trusts the count to
+# bound a slice, and the page right after the cached last page is
+# re-checked against a fresh COUNT(*) before returning 404; pages further
+# out 404 without touching the database. A count that is too high can
+# still produce an empty trailing page until the entry expires.
+POSTS_COUNT_CACHE_TIMEOUT = 60
+POSTS_COUNT_VERSION_KEY = 'posts_count_version'
+
+
+def reset_posts_count_cache():
+    try:
+        cache.incr(POSTS_COUNT_VERSION_KEY)
+    except ValueError:
+        pass
+
+
+def get_posts_count_cache_key(key):
+    version = cache.get_or_set(POSTS_COUNT_VERSION_KEY, 1, None)
+    return f'posts_count:{version}:{key}'
+
+
+class PkPaginator(Paginator):
+
+    def __init__(self, *args, count_cache_key=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.count_cache_key = count_cache_key
+
+    @cached_property
+    def count(self):
+        if self.count_cache_key is None:
+            return self.object_list.count()
+        return cache.get_or_set(
+            get_posts_count_cache_key(self.count_cache_key),
+            self.object_list.count,
+            POSTS_COUNT_CACHE_TIMEOUT
+        )
+
+    def refresh_count(self):
+        self.__dict__.pop('num_pages', None)
+        self.count = self.object_list.count()
+        cache.set(
+            get_posts_count_cache_key(self.count_cache_key),
+            self.count,
+            POSTS_COUNT_CACHE_TIMEOUT
+        )
+
+    def validate_number(self, number):
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            if (
+                self.count_cache_key is None
+                or int(number) != self.num_pages + 1
+            ):
+                raise
+            self.refresh_count()
+            return super().validate_number(number)
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        top = bottom + self.per_page
+        if top + self.orphans >= self.count:
+            top += self.orphans
+        return self._get_page(
+            self.object_list.filter(
+                pk__in=self.object_list.values('pk')[bottom:top]
+            ),
+            number,
+            self
+        )
@@ -0,0 +1,64 @@
+from threading import local
+
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from .models import Category, Comment, Post
+from .paginators import reset_posts_count_cache
+
+
+pending_comment_count = local()
+
+
+def update_comment_count(*post_ids):
+    comment_count = Comment.objects.filter(
+        post=OuterRef('pk')
+    ).order_by().values('post').annotate(
+        count=Count('*')
+    ).values('count')
+    Post.objects.filter(pk__in=post_ids).update(
+        comment_count=Coalesce(Subquery(comment_count), 0)
+    )
+
+
+@receiver(post_init, sender=Comment)
+def remember_comment_post(sender, instance, **kwargs):
+    instance.previous_post_id = instance.__dict__.get('post_id')
+
+
+@receiver(post_save, sender=Comment)
+def update_comment_count_on_save(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    previous_post_id = instance.previous_post_id
+    if created or previous_post_id != instance.post_id:
+        update_comment_count(
+            *{instance.post_id, previous_post_id} - {None}
+        )
+    instance.previous_post_id = instance.post_id
+
+
+def update_pending_comment_count():
+    post_ids = getattr(pending_comment_count, 'post_ids', None)
+    if post_ids:
+        pending_comment_count.post_ids = set()
+        update_comment_count(*post_ids)
+
+
+@receiver(post_delete, sender=Comment)
+def update_comment_count_on_delete(sender, instance, **kwargs):
+    if not hasattr(pending_comment_count, 'post_ids'):
+        pending_comment_count.post_ids = set()
+    pending_comment_count.post_ids.add(instance.post_id)
+    transaction.on_commit(update_pending_comment_count)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def reset_posts_count(sender, **kwargs):
+    reset_posts_count_cache()
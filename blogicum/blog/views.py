@@ -1,5 +1,8 @@
+from functools import cached_property
+
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
-from django.db.models import Count
+from django.db import IntegrityError, transaction
+from django.db.models import Prefetch, Q
 from django.http import Http404
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse
@@ -10,54 +13,98 @@ from django.views.generic import (
 
 from .forms import CommentForm, PostForm
 from .models import Category, Comment, Post, User
+from .paginators import PkPaginator
 
 
 NUM_POSTS_ON_PAGE = 10
+POST_LIST_FIELDS = (
+    'title',
+    'text',
+    'pub_date',
+    'image',
+    'is_published',
+    'comment_count',
+    'author__username',
+    'category__title',
+    'category__slug',
+    'category__is_published',
+    'location__name',
+    'location__is_published',
+)
+
+
+def published_q(now=None):
+    return (
+        Q(pub_date__lte=now or timezone.now())
+        & Q(is_published=True)
+        & Q(category__is_published=True)
+    )
 
 
-def get_posts_queryset(published=False, with_comments_count=False):
+def get_posts_queryset(published=False, now=None, for_list=False):
     posts = Post.objects.select_related(
         'author',
         'category',
         'location',
     )
     if published:
-        posts = posts.filter(
-            pub_date__lte=timezone.now(),
-            is_published=True,
-            category__is_published=True
-        )
-    if with_comments_count:
-        posts = posts.annotate(
-            comment_count=Count('comments')
-        ).order_by('-pub_date')
+        posts = posts.filter(published_q(now))
+    if for_list:
+        posts = posts.only(*POST_LIST_FIELDS)
     return posts
 
 
 class OnlyAuthorMixin(UserPassesTestMixin):
 
+    def get_object(self, queryset=None):
+        if getattr(self, 'object', None) is None:
+            self.object = super().get_object(queryset)
+        return self.object
+
     def test_func(self):
-        object = self.get_object()
-        return object.author == self.request.user
+        return (
+            self.request.user.is_authenticated
+            and self.get_object().author_id == self.request.user.pk
+        )
 
     def handle_no_permission(self):
-        return redirect('blog:post_detail', self.get_object().pk)
+        return redirect('blog:post_detail', self.kwargs['post_id'])
 
 
-class HomePageListView(ListView):
-    queryset = get_posts_queryset(
-        published=True,
-        with_comments_count=True
-    )
-    template_name = 'blog/index.html'
+class PostListMixin:
     paginate_by = NUM_POSTS_ON_PAGE
+    paginator_class = PkPaginator
+
+    def get_count_cache_key(self):
+        return None
+
+    def get_paginator(self, *args, **kwargs):
+        return super().get_paginator(
+            *args,
+            count_cache_key=self.get_count_cache_key(),
+            **kwargs
+        )
+
 
+class HomePageListView(PostListMixin, ListView):
+    template_name = 'blog/index.html'
+
+    def get_count_cache_key(self):
+        return 'index'
 
-class CategoryPostsListView(ListView):
+    def get_queryset(self):
+        return get_posts_queryset(
+            published=True,
+            now=timezone.now(),
+            for_list=True
+        )
+
+
+class CategoryPostsListView(PostListMixin, ListView):
     template_name = 'blog/category.html'
-    paginate_by = NUM_POSTS_ON_PAGE
 
-    def get_category_object(self):
+    @cached_property
+    def category(self):
         return get_object_or_404(
             Category,
             is_published=True,
@@ -67,14 +114,18 @@ class CategoryPostsListView(ListView):
     def get_queryset(self):
         return get_posts_queryset(
             published=True,
-            with_comments_count=True
+            now=timezone.now(),
+            for_list=True
         ).filter(
-            category=self.get_category_object()
+            category_id=self.category.pk
         )
 
+    def get_count_cache_key(self):
+        return f'category:{self.category.slug}'
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['category'] = self.get_category_object()
+        context['category'] = self.category
         return context
 
 
@@ -87,28 +138,33 @@ class ReverseToProfileMixin:
         )
 
 
-class UserListView(ListView):
+class UserListView(PostListMixin, ListView):
     template_name = 'blog/profile.html'
-    paginate_by = NUM_POSTS_ON_PAGE
 
-    def get_user_object(self):
+    @cached_property
+    def user(self):
         return get_object_or_404(
             User, username=self.kwargs['username']
         )
 
     def get_queryset(self):
+        user = self.user
         return get_posts_queryset(
-            published=(
-                self.request.user != self.get_user_object()
-            ),
-            with_comments_count=True
+            published=self.request.user != user,
+            now=timezone.now(),
+            for_list=True
         ).filter(
-            author=self.get_user_object()
+            author_id=user.pk
         )
 
+    def get_count_cache_key(self):
+        if self.request.user == self.user:
+            return None
+        return f'profile:{self.user.pk}'
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['profile'] = self.get_user_object()
+        context['profile'] = self.user
         return context
 
 
@@ -137,30 +193,23 @@ class PostMixin:
 
 
 class PostDetailView(DetailView):
-    queryset = get_posts_queryset(
-        published=False,
-        with_comments_count=False
-    )
     template_name = 'blog/detail.html'
     pk_url_kwarg = 'post_id'
 
-    def get_object(self, queryset=None):
-        post = super().get_object(queryset)
-        if self.request.user != post.author and (
-            post.pub_date > timezone.now()
-            or not post.is_published
-            or not post.category.is_published
-        ):
-            raise Http404
-        else:
-            return post
+    def get_queryset(self):
+        return get_posts_queryset(published=False).filter(
+            published_q() | Q(author_id=self.request.user.pk)
+        ).prefetch_related(
+            Prefetch(
+                'comments',
+                queryset=Comment.objects.select_related('author')
+            )
+        )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['form'] = CommentForm()
-        context['comments'] = self.object.comments.select_related(
-            'author'
-        )
+        context['comments'] = self.object.comments.all()
         return context
 
 
@@ -197,11 +246,7 @@ class PostDeleteView(
     ReverseToProfileMixin,
     DeleteView
 ):
-
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        context['form'] = PostForm(instance=self.object)
-        return context
+    pass
 
 
 class CommentMixin:
@@ -237,8 +282,12 @@ class CommentCreateView(
 
     def form_valid(self, form):
         form.instance.author = self.request.user
-        form.instance.post = self.get_post_object()
-        return super().form_valid(form)
+        form.instance.post_id = self.kwargs['post_id']
+        try:
+            with transaction.atomic():
+                return super().form_valid(form)
+        except IntegrityError:
+            raise Http404
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
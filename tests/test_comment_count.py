@@ -0,0 +1,117 @@
+import pytest
+from django.db import connection
+from django.db.models import Model
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+from blog.models import Comment, Post
+
+
+def get_comment_count(post: Model) -> int:
+    return Post.objects.get(pk=post.pk).comment_count
+
+
+@pytest.mark.django_db
+def test_comment_count_on_create_and_delete(
+        mixer: Mixer,
+        user: Model,
+        post_with_published_location: Model,
+        django_capture_on_commit_callbacks,
+):
+    assert get_comment_count(post_with_published_location) == 0, (
+        "Убедитесь, что у нового поста количество комментариев равно нулю."
+    )
+    comments = mixer.cycle(2).blend(
+        Comment, post=post_with_published_location, author=user
+    )
+    assert get_comment_count(post_with_published_location) == 2, (
+        "Убедитесь, что при создании комментария увеличивается "
+        "количество комментариев поста."
+    )
+    with django_capture_on_commit_callbacks(execute=True):
+        comments[0].delete()
+    assert get_comment_count(post_with_published_location) == 1, (
+        "Убедитесь, что при удалении комментария уменьшается "
+        "количество комментариев поста."
+    )
+
+
+@pytest.mark.django_db
+def test_comment_count_on_text_edit(
+        mixer: Mixer,
+        user: Model,
+        post_with_published_location: Model,
+):
+    comment = mixer.blend(
+        Comment, post=post_with_published_location, author=user
+    )
+    comment = Comment.objects.get(pk=comment.pk)
+    comment.text = "Отредактированный комментарий"
+    with CaptureQueriesContext(connection) as queries:
+        comment.save()
+    assert len(queries) == 1, (
+        "Убедитесь, что при редактировании текста комментария "
+        "выполняется только один запрос."
+    )
+    assert get_comment_count(post_with_published_location) == 1, (
+        "Убедитесь, что при редактировании комментария не меняется "
+        "количество комментариев поста."
+    )
+
+
+@pytest.mark.django_db
+def test_comment_count_on_move_to_another_post(
+        mixer: Mixer,
+        user: Model,
+        post_with_published_location: Model,
+        post_of_another_author: Model,
+        django_capture_on_commit_callbacks,
+):
+    comment = mixer.blend(
+        Comment, post=post_with_published_location, author=user
+    )
+    comment.post = post_of_another_author
+    comment.save()
+    assert get_comment_count(post_with_published_location) == 0, (
+        "Убедитесь, что при переносе комментария к другому посту "
+        "уменьшается количество комментариев исходного поста."
+    )
+    assert get_comment_count(post_of_another_author) == 1, (
+        "Убедитесь, что при переносе комментария к другому посту "
+        "увеличивается количество комментариев нового поста."
+    )
+    with django_capture_on_commit_callbacks(execute=True):
+        comment.delete()
+    assert get_comment_count(post_of_another_author) == 0, (
+        "Убедитесь, что при удалении перенесённого комментария "
+        "уменьшается количество комментариев поста."
+    )
+    assert get_comment_count(post_with_published_location) == 0
+
+
+@pytest.mark.django_db
+def test_comment_count_single_update_on_cascade_delete(
+        mixer: Mixer,
+        another_user: Model,
+        post_with_published_location: Model,
+        post_of_another_author: Model,
+        django_capture_on_commit_callbacks,
+):
+    mixer.cycle(5).blend(
+        Comment, post=post_with_published_location, author=another_user
+    )
+    mixer.cycle(5).blend(
+        Comment, post=post_of_another_author, author=another_user
+    )
+    with CaptureQueriesContext(connection) as queries:
+        with django_capture_on_commit_callbacks(execute=True):
+            another_user.delete()
+    count_updates = [
+        query for query in queries
+        if query["sql"].startswith('UPDATE "blog_post"')
+    ]
+    assert len(count_updates) == 1, (
+        "Убедитесь, что при каскадном удалении комментариев количество "
+        "комментариев пересчитывается одним запросом."
+    )
+    assert get_comment_count(post_with_published_location) == 0
@@ -0,0 +1,139 @@
+import pytest
+from django.core.cache import cache
+from django.core.paginator import EmptyPage
+from django.db import connection
+from django.db.models import Model
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+from blog.models import Post
+from blog.paginators import PkPaginator
+
+COUNT_CACHE_KEY = "test"
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def get_cached_count() -> int:
+    posts = Post.objects.filter(
+        pub_date__lte=timezone.now(),
+        is_published=True,
+        category__is_published=True,
+    )
+    return PkPaginator(
+        posts, 10, count_cache_key=COUNT_CACHE_KEY
+    ).count
+
+
+@pytest.mark.django_db
+def test_count_cache_reset_on_post_save_and_delete(
+        mixer: Mixer,
+        user: Model,
+        published_category: Model,
+):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now(),
+    )
+    assert get_cached_count() == 1
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now(),
+    )
+    assert get_cached_count() == 2, (
+        "Убедитесь, что кэш количества постов сбрасывается "
+        "при создании поста."
+    )
+    post.is_published = False
+    post.save()
+    assert get_cached_count() == 1, (
+        "Убедитесь, что кэш количества постов сбрасывается "
+        "при изменении поста."
+    )
+    Post.objects.exclude(pk=post.pk).get().delete()
+    assert get_cached_count() == 0, (
+        "Убедитесь, что кэш количества постов сбрасывается "
+        "при удалении поста."
+    )
+
+
+@pytest.mark.django_db
+def test_count_cache_reset_on_category_save_and_delete(
+        mixer: Mixer,
+        user: Model,
+        published_category: Model,
+):
+    mixer.cycle(2).blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now(),
+    )
+    assert get_cached_count() == 2
+    published_category.is_published = False
+    published_category.save()
+    assert get_cached_count() == 0, (
+        "Убедитесь, что кэш количества постов сбрасывается "
+        "при изменении категории."
+    )
+    published_category.is_published = True
+    published_category.save()
+    assert get_cached_count() == 2
+    published_category.delete()
+    assert get_cached_count() == 0, (
+        "Убедитесь, что кэш количества постов сбрасывается "
+        "при удалении категории."
+    )
+
+
+@pytest.mark.django_db
+def test_stale_count_does_not_hide_last_page(
+        mixer: Mixer,
+        user: Model,
+        published_category: Model,
+):
+    mixer.cycle(10).blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now(),
+    )
+    assert get_cached_count() == 10
+    post = Post.objects.first()
+    post.pk = None
+    Post.objects.bulk_create([post])
+    posts = Post.objects.filter(
+        pub_date__lte=timezone.now(),
+        is_published=True,
+        category__is_published=True,
+    )
+    paginator = PkPaginator(posts, 10, count_cache_key=COUNT_CACHE_KEY)
+    page = paginator.page(2)
+    assert len(page.object_list) == 1, (
+        "Убедитесь, что устаревшее кэшированное количество постов "
+        "не скрывает последнюю страницу."
+    )
+
+
+@pytest.mark.django_db
+def test_far_out_of_range_page_uses_cached_count(
+        mixer: Mixer,
+        user: Model,
+        published_category: Model,
+):
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now(),
+    )
+    assert get_cached_count() == 1
+    posts = Post.objects.all()
+    paginator = PkPaginator(posts, 10, count_cache_key=COUNT_CACHE_KEY)
+    with CaptureQueriesContext(connection) as queries:
+        with pytest.raises(EmptyPage):
+            paginator.page(9999)
+    assert not queries, (
+        "Убедитесь, что запрос страницы далеко за пределами списка "
+        "не выполняет запросов к базе данных."
+    )